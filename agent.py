@@ -9,8 +9,10 @@ about slot lag and node health in Prometheus format.
 import os
 import sys
 import time
+import queue
 import logging
 import threading
+from dataclasses import dataclass, field
 from dotenv import load_dotenv
 from prometheus_client import CollectorRegistry
 
@@ -20,7 +22,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 from src.solana_client import SolanaClient
 from src.metrics_collector import MetricsCollector
 from src.http_server import MetricsServer
-from src.push_client import PushClient
+from src.push_client import PushClient, load_push_config
 
 # Configure logging
 logging.basicConfig(
@@ -29,59 +31,125 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# .env only needs to be read once per process
+_DOTENV_LOADED = False
 
-def load_config():
+
+@dataclass(frozen=True)
+class AgentConfig:
+    """Agent configuration, read once from the environment at startup."""
+    
+    local_rpc_port: int
+    helius_rpc_url: str
+    public_rpc_url: str
+    node_name: str
+    metrics_port: int
+    metrics_bind_address: str
+    check_interval: int
+    metrics_expo_ttl: float
+    push: dict = field(repr=False)  # Contains the monitoring API key
+
+
+def load_config() -> AgentConfig:
     """Load configuration from environment variables."""
+    global _DOTENV_LOADED
+    
     # Load .env file
-    load_dotenv()
+    if not _DOTENV_LOADED:
+        load_dotenv()
+        _DOTENV_LOADED = True
     
-    config = {
-        'local_rpc_port': int(os.getenv('LOCAL_RPC_PORT', '8899')),
-        'helius_rpc_url': os.getenv('HELIUS_RPC_URL', 'https://api.mainnet-beta.solana.com'),
-        'public_rpc_url': os.getenv('PUBLIC_RPC_URL', 'https://api.mainnet-beta.solana.com'),
-        'node_name': os.getenv('NODE_NAME', 'unknown-node'),
-        'metrics_port': int(os.getenv('METRICS_PORT', '9100')),
-        'metrics_bind_address': os.getenv('METRICS_BIND_ADDRESS', '0.0.0.0'),
-        'check_interval': int(os.getenv('CHECK_INTERVAL', '30')),
-    }
+    config = AgentConfig(
+        local_rpc_port=int(os.getenv('LOCAL_RPC_PORT', '8899')),
+        helius_rpc_url=os.getenv('HELIUS_RPC_URL', 'https://api.mainnet-beta.solana.com'),
+        public_rpc_url=os.getenv('PUBLIC_RPC_URL', 'https://api.mainnet-beta.solana.com'),
+        node_name=os.getenv('NODE_NAME', 'unknown-node'),
+        metrics_port=int(os.getenv('METRICS_PORT', '9100')),
+        metrics_bind_address=os.getenv('METRICS_BIND_ADDRESS', '0.0.0.0'),
+        check_interval=int(os.getenv('CHECK_INTERVAL', '30')),
+        metrics_expo_ttl=float(os.getenv('METRICS_EXPO_TTL', '5')),
+        push=load_push_config(),
+    )
     
     # Validate required config
-    if config['node_name'] == 'unknown-node':
+    if config.node_name == 'unknown-node':
         logger.warning("NODE_NAME not set, using 'unknown-node'")
     
     logger.info(f"Configuration loaded:")
-    logger.info(f"  Node Name: {config['node_name']}")
-    logger.info(f"  Local RPC Port: {config['local_rpc_port']}")
-    logger.info(f"  Metrics Port: {config['metrics_port']}")
-    logger.info(f"  Metrics Bind: {config['metrics_bind_address']}")
-    logger.info(f"  Check Interval: {config['check_interval']}s")
+    logger.info(f"  Node Name: {config.node_name}")
+    logger.info(f"  Local RPC Port: {config.local_rpc_port}")
+    logger.info(f"  Metrics Port: {config.metrics_port}")
+    logger.info(f"  Metrics Bind: {config.metrics_bind_address}")
+    logger.info(f"  Check Interval: {config.check_interval}s")
     
     return config
 
 
-def metrics_update_loop(collector, push_client, interval):
+def enqueue_push(push_queue, metrics_data):
+    """Queue metrics for pushing, dropping the oldest entry if the queue is full."""
+    try:
+        push_queue.put_nowait(metrics_data)
+    except queue.Full:
+        try:
+            push_queue.get_nowait()
+        except queue.Empty:
+            pass
+        logger.warning("Push queue full, dropping oldest metrics")
+        push_queue.put_nowait(metrics_data)
+
+
+def push_worker(push_client, push_queue):
+    """Background thread to push queued metrics to the monitoring server."""
+    logger.info("Starting push worker")
+    
+    while True:
+        metrics_data = push_queue.get()
+        try:
+            push_client.push_metrics(metrics_data)
+        except Exception as e:
+            logger.error(f"Error in push worker: {e}")
+
+
+def metrics_update_loop(collector, push_queue, interval):
     """Background thread to update metrics periodically."""
     logger.info(f"Starting metrics update loop (interval={interval}s)")
     
+    # Schedule against a monotonic deadline so slow updates don't stretch the period
+    next_deadline = time.monotonic()
+    overruns = 0
+    
     while True:
         try:
             # Collect metrics
             collector.update_metrics()
             
-            # Push metrics to monitoring server if enabled
-            if push_client.enabled:
-                metrics_data = collector.get_metrics_dict()
-                push_client.push_metrics(metrics_data)
+            # Hand off to the push worker so network stalls don't delay collection
+            if push_queue is not None:
+                enqueue_push(push_queue, collector.get_metrics_dict())
                 
         except Exception as e:
             logger.error(f"Error in metrics update loop: {e}")
         
-        time.sleep(interval)
+        next_deadline += interval
+        sleep_for = next_deadline - time.monotonic()
+        if sleep_for > 0:
+            overruns = 0
+            time.sleep(sleep_for)
+        else:
+            # Start the next tick now rather than bursting to catch up on missed ones
+            next_deadline = time.monotonic()
+            overruns += 1
+            if overruns >= 3:
+                logger.warning(
+                    f"Metrics update overran the {interval}s interval "
+                    f"{overruns} times in a row"
+                )
 
 
 def main():
     """Main entry point."""
     logger.info("Starting Solana Monitoring Agent...")
+    push_client = None
     
     try:
         # Load configuration
@@ -91,51 +159,65 @@ def main():
         registry = CollectorRegistry()
         
         # Use Helius RPC as reference, fallback to public
-        reference_rpc = config['helius_rpc_url']
+        reference_rpc = config.helius_rpc_url
         if 'YOUR_API_KEY_HERE' in reference_rpc:
             logger.warning("Helius API key not configured, using public RPC")
-            reference_rpc = config['public_rpc_url']
+            reference_rpc = config.public_rpc_url
         
         solana_client = SolanaClient(
-            local_rpc_port=config['local_rpc_port'],
+            local_rpc_port=config.local_rpc_port,
             reference_rpc_url=reference_rpc
         )
+        # Slot lag against another cluster's tip would be meaningless
+        solana_client.check_reference_cluster()
         
         collector = MetricsCollector(
-            node_name=config['node_name'],
+            node_name=config.node_name,
             solana_client=solana_client,
             registry=registry
         )
         
         # Initialize push client (for agent-initiated monitoring)
-        push_client = PushClient()
+        push_client = PushClient(config.push)
+        push_queue = None
+        
+        # Start push worker in background thread if enabled
+        if push_client.enabled:
+            push_queue = queue.Queue(maxsize=4)
+            push_thread = threading.Thread(
+                target=push_worker,
+                args=(push_client, push_queue),
+                daemon=True
+            )
+            push_thread.start()
         
         # Do initial metrics collection
         logger.info("Performing initial metrics collection...")
         collector.update_metrics()
         
         # Push initial metrics if enabled
-        if push_client.enabled:
-            metrics_data = collector.get_metrics_dict()
-            push_client.push_metrics(metrics_data)
+        if push_queue is not None:
+            enqueue_push(push_queue, collector.get_metrics_dict())
         
         # Start metrics update loop in background thread
         update_thread = threading.Thread(
             target=metrics_update_loop,
-            args=(collector, push_client, config['check_interval']),
+            args=(collector, push_queue, config.check_interval),
             daemon=True
         )
         update_thread.start()
         
         # Start HTTP server (blocks)
         server = MetricsServer(
-            port=config['metrics_port'],
+            port=config.metrics_port,
             registry=registry,
-            bind_address=config['metrics_bind_address']
+            bind_address=config.metrics_bind_address,
+            expo_ttl=config.metrics_expo_ttl,
+            collector=collector
         )
         
         logger.info("Agent ready!")
-        logger.info(f"Metrics available at http://localhost:{config['metrics_port']}/metrics")
+        logger.info(f"Metrics available at http://localhost:{config.metrics_port}/metrics")
         
         server.start()
         
@@ -145,6 +227,10 @@ def main():
     except Exception as e:
         logger.error(f"Fatal error: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        # Don't let a push retry backoff hold up shutdown
+        if push_client is not None:
+            push_client.stop()
 
 
 if __name__ == '__main__':
@@ -2,39 +2,130 @@
 HTTP server to expose Prometheus metrics.
 """
 
+import time
 import logging
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from prometheus_client import CollectorRegistry, generate_latest, CONTENT_TYPE_LATEST
 
 logger = logging.getLogger(__name__)
 
 
+class _ExpoCache:
+    """
+    Serialized /metrics payload shared between requests.
+    
+    Metrics only change once per check interval, so the rendered exposition
+    is reused until it is older than the configured TTL. The payload and its
+    ETag are stored together so readers never see a mismatched pair; the
+    ETag only changes when the rendered bytes do.
+    """
+    
+    entry = (b'', '""')  # (payload, etag)
+    generated_at: float = float('-inf')
+    lock = threading.Lock()
+
+
+class PooledHTTPServer(ThreadingHTTPServer):
+    """
+    Threading HTTP server with a bounded number of handler threads.
+    
+    Keeps /health responsive while /metrics is being rendered, without
+    spawning an unbounded number of threads under scanner floods. Handler
+    threads stay daemonic so idle keep-alive connections never delay exit.
+    """
+    
+    daemon_threads = True
+    max_workers = 16
+    
+    def __init__(self, *args, **kwargs):
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        super().__init__(*args, **kwargs)
+    
+    def process_request(self, request, client_address):
+        """Wait for a free handler slot, then serve on a new thread."""
+        self._slots.acquire()
+        try:
+            super().process_request(request, client_address)
+        except BaseException:
+            self._slots.release()
+            raise
+    
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._slots.release()
+
+
 class MetricsHandler(BaseHTTPRequestHandler):
     """HTTP request handler for metrics endpoint."""
     
-    registry = None  # Will be set by server
+    # Keep scrape connections open between requests
+    protocol_version = 'HTTP/1.1'
+    # Close idle keep-alive connections so they don't hold handler slots
+    timeout = 30
+    
+    registry = None   # Will be set by server
+    collector = None  # Will be set by server
+    expo_ttl = 5.0    # Will be set by server
     
     def do_GET(self):
         """Handle GET requests."""
         if self.path == '/metrics':
+            metrics, etag = self._get_exposition()
+            
+            # Scrapers that already hold this version don't need the body
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            
             self.send_response(200)
             self.send_header('Content-Type', CONTENT_TYPE_LATEST)
+            self.send_header('Content-Length', str(len(metrics)))
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', f'max-age={int(self.expo_ttl)}')
             self.end_headers()
-            
-            # Generate Prometheus metrics
-            metrics = generate_latest(self.registry)
             self.wfile.write(metrics)
             
         elif self.path == '/health' or self.path == '/':
-            self.send_response(200)
-            self.send_header('Content-Type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(b'OK')
+            self._send_text(200, b'OK')
             
         else:
-            self.send_response(404)
-            self.end_headers()
-            self.wfile.write(b'Not Found')
+            self._send_text(404, b'Not Found')
+    
+    def _send_text(self, status: int, body: bytes):
+        """Send a plain-text response with an explicit length for keep-alive."""
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _get_exposition(self) -> tuple:
+        """
+        Return the Prometheus exposition and its ETag, regenerating them
+        once the TTL expires.
+        """
+        if time.monotonic() - _ExpoCache.generated_at < self.expo_ttl:
+            return _ExpoCache.entry
+        
+        with _ExpoCache.lock:
+            # Another thread may have refreshed the cache while we waited
+            if time.monotonic() - _ExpoCache.generated_at < self.expo_ttl:
+                return _ExpoCache.entry
+            
+            if self.collector is not None:
+                payload = self.collector.render_text()
+            else:
+                payload = generate_latest(self.registry)
+            now = time.monotonic()
+            if payload != _ExpoCache.entry[0]:
+                _ExpoCache.entry = (payload, f'"{int(now * 1000)}"')
+            _ExpoCache.generated_at = now
+            return _ExpoCache.entry
     
     def log_message(self, format, *args):
         """Override to use our logger."""
@@ -54,13 +145,17 @@ class MetricsHandler(BaseHTTPRequestHandler):
 class MetricsServer:
     """HTTP server for exposing Prometheus metrics."""
     
-    def __init__(self, port: int, registry: CollectorRegistry, bind_address: str = '0.0.0.0'):
+    def __init__(self, port: int, registry: CollectorRegistry, bind_address: str = '0.0.0.0',
+                 expo_ttl: float = 5.0, collector=None):
         """
         Initialize metrics server.
         
         Args:
             port: Port to listen on
             registry: Prometheus registry
+            expo_ttl: Seconds to reuse a rendered /metrics payload
+            collector: Optional MetricsCollector whose render_text() is
+                served instead of walking the registry
         """
         self.port = port
         self.bind_address = bind_address
@@ -69,13 +164,15 @@ class MetricsServer:
         
         # Set registry for handler
         MetricsHandler.registry = registry
+        MetricsHandler.collector = collector
+        MetricsHandler.expo_ttl = expo_ttl
         
         logger.info(f"Initialized MetricsServer on {bind_address}:{port}")
     
     def start(self):
         """Start the HTTP server."""
         try:
-            self.server = HTTPServer((self.bind_address, self.port), MetricsHandler)
+            self.server = PooledHTTPServer((self.bind_address, self.port), MetricsHandler)
             logger.info(
                 f"Metrics server listening on http://{self.bind_address}:{self.port}/metrics"
             )
@@ -6,16 +6,31 @@ Collects slot lag and health metrics and exposes them in Prometheus format.
 import time
 import logging
 from prometheus_client import Gauge, Info, CollectorRegistry
+from prometheus_client.utils import floatToGoString
 from typing import Optional
 from .solana_client import SolanaClient
 
 logger = logging.getLogger(__name__)
 
 
+def _escape_help(text: str) -> str:
+    return text.replace('\\', r'\\').replace('\n', r'\n')
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _labels_text(labels: dict) -> str:
+    """Format labels the way generate_latest does (sorted by name)."""
+    return ','.join(f'{k}="{_escape_label(v)}"' for k, v in sorted(labels.items()))
+
+
 class MetricsCollector:
     """Collects and exposes Solana node metrics."""
     
-    def __init__(self, node_name: str, solana_client: SolanaClient, registry: CollectorRegistry):
+    def __init__(self, node_name: str, solana_client: SolanaClient, registry: CollectorRegistry,
+                 rpc_label: str = 'catchup'):
         """
         Initialize metrics collector.
         
@@ -23,10 +38,14 @@ class MetricsCollector:
             node_name: Identifier for this node
             solana_client: SolanaClient instance
             registry: Prometheus registry
+            rpc_label: Value of the 'rpc' label on solana_slot_cluster
         """
         self.node_name = node_name
+        self.rpc_label = rpc_label
         self.solana_client = solana_client
         self.registry = registry
+        self._last_version: Optional[str] = None
+        self._last_snapshot: dict = {}
         
         # Define metrics
         self.slot_current = Gauge(
@@ -71,12 +90,56 @@ class MetricsCollector:
             registry=registry
         )
         
+        # Gauges read these values at scrape time, so updates are plain
+        # attribute assignments instead of locked Gauge.set() calls
+        self._slot_current_val = 0.0
+        self._slot_cluster_val = 0.0
+        self._slot_lag_val = 0.0
+        self._node_health_val = 0.0
+        self._last_update_val = 0.0
+        self._rpc_error_val = 0.0
+        
+        self.node_health.labels(node=node_name).set_function(lambda: self._node_health_val)
+        self.last_update.labels(node=node_name).set_function(lambda: self._last_update_val)
+        self.rpc_error.labels(node=node_name).set_function(lambda: self._rpc_error_val)
+        
+        # The slot series stay absent until a slot has actually been
+        # measured, so a node that was never reached doesn't report 0 lag
+        self._slots_bound = False
+        self._live = {'_node_health_val', '_last_update_val', '_rpc_error_val'}
+        
         self.node_info = Info(
             'solana_node',
             'Solana node information',
             registry=registry
         )
         
+        # Everything but the sample values is rendered once for render_text()
+        self._text_series = []
+        for gauge, labels, attr in (
+            (self.slot_current, {'node': node_name}, '_slot_current_val'),
+            (self.slot_cluster, {'node': node_name, 'rpc': rpc_label}, '_slot_cluster_val'),
+            (self.slot_lag, {'node': node_name}, '_slot_lag_val'),
+            (self.node_health, {'node': node_name}, '_node_health_val'),
+            (self.last_update, {'node': node_name}, '_last_update_val'),
+            (self.rpc_error, {'node': node_name}, '_rpc_error_val'),
+        ):
+            metric = gauge.describe()[0]
+            head = (
+                f"# HELP {metric.name} {_escape_help(metric.documentation)}\n"
+                f"# TYPE {metric.name} gauge\n"
+            )
+            sample = f"{metric.name}{{{_labels_text(labels)}}} "
+            self._text_series.append((head.encode('utf-8'), sample.encode('utf-8'), attr))
+        
+        info = self.node_info.describe()[0]
+        self._info_name = f"{info.name}_info"
+        self._info_prolog = (
+            f"# HELP {self._info_name} {_escape_help(info.documentation)}\n"
+            f"# TYPE {self._info_name} gauge\n"
+        ).encode('utf-8')
+        self._info_text = f"{self._info_name} 1.0\n".encode('utf-8')
+        
         logger.info(f"Initialized MetricsCollector for node: {node_name}")
     
     def update_metrics(self) -> bool:
@@ -87,52 +150,136 @@ class MetricsCollector:
             True if successful, False otherwise
         """
         try:
-            # Get catchup status
-            catchup_status = self.solana_client.get_catchup_status()
+            # Get slot, health and version in one round-trip
+            status = self.solana_client.get_node_status()
             
-            if catchup_status is None:
+            if status is None:
                 logger.warning("Failed to get catchup status")
-                self.rpc_error.labels(node=self.node_name).set(1)
-                self.node_health.labels(node=self.node_name).set(0)
+                self._rpc_error_val = 1
+                self._node_health_val = 0
+                self._last_snapshot = {
+                    'solana_node_health': 0,
+                    'solana_metrics_last_update_timestamp': time.time(),
+                    'solana_rpc_error': 1
+                }
+                return False
+            
+            if status['slot_lag'] is None:
+                # The local node answered but the cluster slot is unknown
+                logger.warning("Failed to get cluster slot")
+                if self._slots_bound:
+                    self._slot_current_val = status['local_slot']
+                self._rpc_error_val = 1
+                self._node_health_val = 1 if status['healthy'] else 0
+                self._set_version(status['version'])
+                self._last_snapshot = {
+                    'solana_node_health': self._node_health_val,
+                    'solana_metrics_last_update_timestamp': time.time(),
+                    'solana_slot_current': status['local_slot'],
+                    'solana_rpc_error': 1
+                }
+                if status['version']:
+                    self._last_snapshot['solana_version'] = status['version']
                 return False
             
             # Update metrics
-            self.slot_current.labels(node=self.node_name).set(catchup_status['local_slot'])
-            self.slot_cluster.labels(node=self.node_name, rpc='catchup').set(catchup_status['reference_slot'])
-            self.slot_lag.labels(node=self.node_name).set(catchup_status['slot_lag'])
-            self.rpc_error.labels(node=self.node_name).set(0)
+            self._slot_current_val = status['local_slot']
+            self._slot_cluster_val = status['reference_slot']
+            self._slot_lag_val = status['slot_lag']
+            self._rpc_error_val = 0
+            if not self._slots_bound:
+                self._bind_slot_series()
             
             # Check health
-            is_healthy = self.solana_client.is_healthy()
-            self.node_health.labels(node=self.node_name).set(1 if is_healthy else 0)
+            is_healthy = status['healthy']
+            self._node_health_val = 1 if is_healthy else 0
             
             # Update timestamp
-            self.last_update.labels(node=self.node_name).set(time.time())
+            now = time.time()
+            self._last_update_val = now
             
-            # Update node info (only once or when changed)
-            version = self.solana_client.get_node_version()
+            version = status['version']
+            self._set_version(version)
+            
+            # Keep a copy for the push client
+            snapshot = {
+                'solana_node_health': 1 if is_healthy else 0,
+                'solana_metrics_last_update_timestamp': now,
+                'solana_slot_current': status['local_slot'],
+                'solana_slot_cluster': status['reference_slot'],
+                'solana_slot_lag': status['slot_lag'],
+                'solana_rpc_error': 0
+            }
             if version:
-                self.node_info.info({
-                    'node_name': self.node_name,
-                    'version': version
-                })
+                snapshot['solana_version'] = version
+            self._last_snapshot = snapshot
             
             logger.info(
-                f"Metrics updated: slot={catchup_status['local_slot']}, "
-                f"lag={catchup_status['slot_lag']}, healthy={is_healthy}"
+                f"Metrics updated: slot={status['local_slot']}, "
+                f"lag={status['slot_lag']}, healthy={is_healthy}"
             )
             
             return True
             
         except Exception as e:
             logger.error(f"Error updating metrics: {e}")
-            self.node_health.labels(node=self.node_name).set(0)
+            self._node_health_val = 0
+            self._last_snapshot = {
+                'solana_node_health': 0,
+                'solana_metrics_last_update_timestamp': time.time()
+            }
             return False
     
+    def _set_version(self, version: Optional[str]):
+        """Update node info (only once or when changed)."""
+        if version and version != self._last_version:
+            node_info = {
+                'node_name': self.node_name,
+                'version': version
+            }
+            self.node_info.info(node_info)
+            self._info_text = (
+                f"{self._info_name}{{{_labels_text(node_info)}}} 1.0\n"
+            ).encode('utf-8')
+            self._last_version = version
+    
+    def _bind_slot_series(self):
+        """Expose the slot gauges once their values have been measured."""
+        self.slot_current.labels(node=self.node_name).set_function(lambda: self._slot_current_val)
+        self.slot_cluster.labels(node=self.node_name, rpc=self.rpc_label).set_function(
+            lambda: self._slot_cluster_val
+        )
+        self.slot_lag.labels(node=self.node_name).set_function(lambda: self._slot_lag_val)
+        self._live |= {'_slot_current_val', '_slot_cluster_val', '_slot_lag_val'}
+        self._slots_bound = True
+    
+    def render_text(self) -> bytes:
+        """
+        Render this collector's metrics in Prometheus text format.
+        
+        Produces the same output as generate_latest() for the collector's
+        fixed set of metrics without walking the registry.
+        
+        Returns:
+            Exposition body as bytes
+        """
+        parts = []
+        live = self._live
+        for head, sample, attr in self._text_series:
+            parts.append(head)
+            if attr in live:
+                parts.append(sample)
+                parts.append(floatToGoString(getattr(self, attr)).encode())
+                parts.append(b'\n')
+        parts.append(self._info_prolog)
+        parts.append(self._info_text)
+        return b''.join(parts)
+    
     def get_current_slot_lag(self) -> Optional[int]:
         """Get current slot lag value."""
         try:
-            catchup_status = self.solana_client.get_catchup_status()
+            # Only the lag is needed, so the CLI fallback may skip slot parsing
+            catchup_status = self.solana_client.get_catchup_status(fast=True)
             if catchup_status:
                 return catchup_status['slot_lag']
             return None
@@ -142,39 +289,9 @@ class MetricsCollector:
     
     def get_metrics_dict(self) -> dict:
         """
-        Get current metrics as a dictionary for pushing to monitoring server.
+        Get metrics from the last update as a dictionary for pushing to monitoring server.
         
         Returns:
             Dictionary of metric name -> value
         """
-        try:
-            catchup_status = self.solana_client.get_catchup_status()
-            is_healthy = self.solana_client.is_healthy()
-            version = self.solana_client.get_node_version()
-            
-            metrics = {
-                'solana_node_health': 1 if is_healthy else 0,
-                'solana_metrics_last_update_timestamp': time.time()
-            }
-            
-            if catchup_status:
-                metrics.update({
-                    'solana_slot_current': catchup_status['local_slot'],
-                    'solana_slot_cluster': catchup_status['reference_slot'],
-                    'solana_slot_lag': catchup_status['slot_lag'],
-                    'solana_rpc_error': 0
-                })
-            else:
-                metrics['solana_rpc_error'] = 1
-            
-            if version:
-                metrics['solana_version'] = version
-            
-            return metrics
-            
-        except Exception as e:
-            logger.error(f"Error getting metrics dict: {e}")
-            return {
-                'solana_node_health': 0,
-                'solana_metrics_last_update_timestamp': time.time()
-            }
\ No newline at end of file
+        return dict(self._last_snapshot)
@@ -4,26 +4,81 @@ Agent-initiated connection (no inbound ports needed)
 """
 
 import os
+import hmac
+import base64
 import json
 import time
+import random
+import hashlib
 import logging
+import threading
+import http.client
 import urllib.request
-import urllib.error
+from urllib.parse import urlsplit, unquote, SplitResult
 from typing import Dict, Optional
 
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json is used otherwise
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _dumps(obj) -> bytes:
+    """Serialize obj to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def _proxy_for(url: SplitResult) -> Optional[SplitResult]:
+    """Return the proxy to use for url from HTTP(S)_PROXY/NO_PROXY, as urllib would."""
+    proxy = urllib.request.getproxies().get(url.scheme)
+    if not proxy or urllib.request.proxy_bypass(url.netloc):
+        return None
+    if '://' not in proxy:
+        proxy = f'http://{proxy}'
+    return urlsplit(proxy)
+
+
+def load_push_config() -> Dict:
+    """Read push settings from environment variables."""
+    return {
+        'enabled': os.getenv('ENABLE_PUSH_MODE', 'false').lower() == 'true',
+        'api_url': os.getenv('MONITORING_API_URL', ''),
+        'api_key': os.getenv('MONITORING_API_KEY', ''),
+        'node_name': os.getenv('NODE_NAME', 'unknown'),
+        'node_identity': os.getenv('NODE_IDENTITY', ''),
+        'retry_attempts': int(os.getenv('PUSH_RETRY_ATTEMPTS', '3')),
+        'sign_payload': os.getenv('PUSH_SIGN_PAYLOAD', 'false').lower() == 'true',
+    }
+
+
 class PushClient:
     """Client for pushing metrics to monitoring server"""
     
-    def __init__(self):
-        self.enabled = os.getenv('ENABLE_PUSH_MODE', 'false').lower() == 'true'
-        self.api_url = os.getenv('MONITORING_API_URL', '')
-        self.api_key = os.getenv('MONITORING_API_KEY', '')
-        self.node_name = os.getenv('NODE_NAME', 'unknown')
-        self.node_identity = os.getenv('NODE_IDENTITY', '')
-        self.retry_attempts = int(os.getenv('PUSH_RETRY_ATTEMPTS', '3'))
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Initialize push client.
+        
+        Args:
+            config: Push settings as returned by load_push_config();
+                read from the environment if not given
+        """
+        if config is None:
+            config = load_push_config()
+        
+        self.enabled = config['enabled']
+        self.api_url = config['api_url']
+        self.api_key = config['api_key']
+        self.node_name = config['node_name']
+        self.node_identity = config['node_identity']
+        self.retry_attempts = config['retry_attempts']
+        self.sign_payload = config['sign_payload']
+        
+        # Set on shutdown to cut retry backoff short
+        self._shutdown = threading.Event()
         
         if self.enabled:
             if not self.api_url:
@@ -34,6 +89,101 @@ class PushClient:
                 self.enabled = False
             else:
                 logger.info(f"Push mode enabled: {self.api_url}")
+        
+        # Constant part of the payload is serialized once and reused
+        self._prefix = (
+            '{"node":' + json.dumps(self.node_name)
+            + ',"metadata":{"agent_version":"1.0.0","identity":'
+            + json.dumps(self.node_identity or None)
+            + ',"push_time":'
+        ).encode('utf-8')
+        
+        # Headers never change between pushes
+        self._headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json',
+            'User-Agent': 'xand-mon-agent/1.0'
+        }
+        
+        # Persistent connection so pushes reuse the TCP/TLS session
+        url = urlsplit(self.api_url)
+        self._scheme = url.scheme
+        self._netloc = url.netloc
+        self._path = url.path or '/'
+        if url.query:
+            self._path += f'?{url.query}'
+        self._conn: Optional[http.client.HTTPConnection] = None
+        
+        # Egress proxy from the environment: HTTPS is tunnelled with CONNECT,
+        # plain HTTP is sent to the proxy with an absolute request URL
+        self._proxy: Optional[str] = None
+        self._proxy_headers: Dict[str, str] = {}
+        proxy = _proxy_for(url) if self.api_url else None
+        if proxy is not None:
+            userinfo, _, hostport = proxy.netloc.rpartition('@')
+            self._proxy = hostport if proxy.port else f'{hostport}:80'
+            if userinfo:
+                token = base64.b64encode(unquote(userinfo).encode('utf-8')).decode('ascii')
+                self._proxy_headers['Proxy-Authorization'] = f'Basic {token}'
+            if self._scheme != 'https':
+                self._path = self.api_url
+                self._headers.update(self._proxy_headers)
+            logger.info(f"Pushing through proxy {hostport}")
+    
+    def stop(self):
+        """Abort any pending retry backoff and stop retrying pushes."""
+        self._shutdown.set()
+    
+    def _get_connection(self) -> http.client.HTTPConnection:
+        """Return the persistent connection, opening it if needed."""
+        if self._conn is None:
+            host = self._proxy or self._netloc
+            if self._scheme == 'https':
+                self._conn = http.client.HTTPSConnection(host, timeout=10)
+                if self._proxy is not None:
+                    self._conn.set_tunnel(self._netloc, headers=self._proxy_headers)
+            else:
+                self._conn = http.client.HTTPConnection(host, timeout=10)
+        return self._conn
+    
+    def _close_connection(self):
+        """Drop the persistent connection so the next push reconnects."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    def _signed_headers(self, data: bytes) -> Dict[str, str]:
+        """Return request headers, adding an HMAC-SHA256 of the body if enabled."""
+        if not self.sign_payload:
+            return self._headers
+        signature = hmac.new(self.api_key.encode('utf-8'), data, hashlib.sha256).hexdigest()
+        return {**self._headers, 'X-Signature': signature}
+    
+    def _post(self, data: bytes) -> http.client.HTTPResponse:
+        """
+        POST data over the persistent connection.
+        
+        If the server already closed an idle keep-alive connection, the
+        request is resent once on a fresh connection.
+        """
+        headers = self._signed_headers(data)
+        conn = self._get_connection()
+        reused = conn.sock is not None
+        try:
+            return self._send(conn, data, headers)
+        except ConnectionError:
+            self._close_connection()
+            if not reused:
+                raise
+            return self._send(self._get_connection(), data, headers)
+    
+    def _send(self, conn: http.client.HTTPConnection, data: bytes,
+              headers: Dict[str, str]) -> http.client.HTTPResponse:
+        """Send a single request and drain the response body."""
+        conn.request('POST', self._path, body=data, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        return response
     
     def push_metrics(self, metrics_data: Dict) -> bool:
         """
@@ -48,59 +198,44 @@ class PushClient:
         if not self.enabled:
             return False
         
-        payload = {
-            'node': self.node_name,
-            'timestamp': int(time.time()),
-            'metrics': metrics_data,
-            'metadata': {
-                'agent_version': '1.0.0',
-                'push_time': time.time(),
-                'identity': self.node_identity or None
-            }
-        }
+        now = time.time()
+        data = b''.join((
+            self._prefix, repr(now).encode(),
+            b'},"timestamp":', str(int(now)).encode(),
+            b',"metrics":', _dumps(metrics_data), b'}'
+        ))
         
         for attempt in range(1, self.retry_attempts + 1):
             try:
-                # Prepare request
-                headers = {
-                    'Authorization': f'Bearer {self.api_key}',
-                    'Content-Type': 'application/json',
-                    'User-Agent': 'xand-mon-agent/1.0'
-                }
-                
-                data = json.dumps(payload).encode('utf-8')
-                req = urllib.request.Request(
-                    self.api_url,
-                    data=data,
-                    headers=headers,
-                    method='POST'
-                )
-                
                 # Send request
-                with urllib.request.urlopen(req, timeout=10) as response:
-                    if response.status == 200:
-                        logger.debug(f"Successfully pushed metrics for {self.node_name}")
-                        return True
-                    else:
-                        logger.warning(f"Push failed with status {response.status}")
-                        
-            except urllib.error.HTTPError as e:
-                logger.error(f"HTTP error pushing metrics (attempt {attempt}/{self.retry_attempts}): {e.code} {e.reason}")
-                if e.code == 401:
-                    logger.error("Authentication failed - check MONITORING_API_KEY")
-                    return False  # Don't retry auth failures
+                response = self._post(data)
+                if response.status == 200:
+                    logger.debug(f"Successfully pushed metrics for {self.node_name}")
+                    return True
+                elif response.status >= 400:
+                    logger.error(f"HTTP error pushing metrics (attempt {attempt}/{self.retry_attempts}): {response.status} {response.reason}")
+                    if response.status == 401:
+                        logger.error("Authentication failed - check MONITORING_API_KEY")
+                        return False  # Don't retry auth failures
+                else:
+                    logger.warning(f"Push failed with status {response.status}")
                     
-            except urllib.error.URLError as e:
-                logger.error(f"Network error pushing metrics (attempt {attempt}/{self.retry_attempts}): {e.reason}")
+            except (http.client.HTTPException, OSError) as e:
+                self._close_connection()
+                logger.error(f"Network error pushing metrics (attempt {attempt}/{self.retry_attempts}): {e}")
                 
             except Exception as e:
+                self._close_connection()
                 logger.error(f"Unexpected error pushing metrics (attempt {attempt}/{self.retry_attempts}): {e}")
             
             # Backoff before retry
             if attempt < self.retry_attempts:
-                backoff = 2 ** attempt  # Exponential backoff: 2, 4, 8 seconds
-                logger.debug(f"Retrying in {backoff} seconds...")
-                time.sleep(backoff)
+                # Full-jitter exponential backoff: up to 2, 4, 8 seconds
+                backoff = random.uniform(0, 2 ** attempt)
+                logger.debug(f"Retrying in {backoff:.1f} seconds...")
+                if self._shutdown.wait(backoff):
+                    logger.info("Shutdown requested, abandoning metrics push")
+                    return False
         
         logger.error(f"Failed to push metrics after {self.retry_attempts} attempts")
         return False
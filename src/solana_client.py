@@ -1,18 +1,331 @@
 """
-Solana CLI client wrapper for monitoring agent.
-Executes solana catchup command and parses output.
+Solana client for monitoring agent.
+Queries node status over JSON-RPC, falling back to the solana CLI.
 """
 
+import os
+import json
+import time
+import signal
 import subprocess
 import re
+import shutil
 import logging
-from typing import Optional, Dict
+import functools
+import queue
+import threading
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from typing import Optional, Dict, Any, Tuple, ClassVar
+
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json is used otherwise
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# solana catchup output formats (CLI fallback only) not handled by
+# _parse_compact, matched in one scan:
+#   du/dt - detailed "Our validator: slot=123456" ... "Cluster: slot=123460"
+#   ps/pb - legacy "Processed slot 123456", optionally "behind by 4 slots"
+_PARSE_RE = re.compile(
+    rb'Our validator:\s+slot[=\s]+(?P<du>\d+).*?Cluster:\s+slot[=\s]+(?P<dt>\d+)'
+    rb'|Processed slot (?P<ps>\d+)(?:.*?behind by (?P<pb>\d+) slots)?',
+    re.IGNORECASE | re.DOTALL
+)
+
+# JSON-RPC request bodies never change, so they are encoded once up front.
+# getSlot asks for the confirmed slot, which is what solana catchup reports
+# by default, so the RPC and CLI paths agree
+_GET_SLOT = b'{"jsonrpc":"2.0","id":1,"method":"getSlot","params":[{"commitment":"confirmed"}]}'
+_GET_HEALTH = b'{"jsonrpc":"2.0","id":1,"method":"getHealth"}'
+_GET_VERSION = b'{"jsonrpc":"2.0","id":1,"method":"getVersion"}'
+_GET_GENESIS_HASH = b'{"jsonrpc":"2.0","id":1,"method":"getGenesisHash"}'
+_STATUS_BATCH = (
+    b'[{"jsonrpc":"2.0","id":1,"method":"getSlot","params":[{"commitment":"confirmed"}]},'
+    b'{"jsonrpc":"2.0","id":2,"method":"getHealth"}]'
+)
+# Same batch plus getVersion, used until the version has been cached
+_STATUS_BATCH_WITH_VERSION = (
+    b'[{"jsonrpc":"2.0","id":1,"method":"getSlot","params":[{"commitment":"confirmed"}]},'
+    b'{"jsonrpc":"2.0","id":2,"method":"getHealth"},'
+    b'{"jsonrpc":"2.0","id":3,"method":"getVersion"}]'
+)
+
+# Failures that mean the JSON-RPC path is unusable and the CLI should be tried:
+# network and HTTP errors, undecodable bodies, and responses that don't have
+# the expected shape (reported as ValueError by the _rpc_* helpers)
+_RPC_ERRORS = (OSError, http.client.HTTPException, ValueError)
+
+# The cluster produces a slot roughly every 400ms, so a fresher reference
+# slot than that carries no extra information
+_REFERENCE_SLOT_TTL = 0.4
+
+# Runs the reference RPC query while the local one is in flight
+_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='solana-rpc')
+
+# CLI calls normally finish in well under a second
+_CLI_TIMEOUT = 5
+
+
+def _run_cli(cmd: Tuple[str, ...], timeout: float = _CLI_TIMEOUT) -> subprocess.CompletedProcess:
+    """
+    Run a CLI command in its own session and capture its raw output.
+    
+    On timeout the command's whole process group is killed, so a hung
+    solana binary can't leave children behind. The new session rules out
+    posix_spawn, but CPython 3.10+ still launches it with vfork.
+    
+    Raises:
+        subprocess.TimeoutExpired if the command doesn't finish in time
+    """
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=True
+    ) as proc:
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            proc.communicate()
+            raise
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+
+def _slot_lag(local_slot: int, reference_slot: int) -> int:
+    """Slots the node is behind the reference, never negative."""
+    diff = reference_slot - local_slot
+    return diff if diff > 0 else 0
+
+
+def _rpc_result(response: Any) -> Any:
+    """
+    Return the result of a single JSON-RPC response object.
+    
+    Raises:
+        ValueError if the response is an error or malformed
+    """
+    if not isinstance(response, dict):
+        raise ValueError(f"Malformed JSON-RPC response: {response!r:.200}")
+    if 'result' not in response:
+        raise ValueError(f"JSON-RPC error: {response.get('error')!r:.200}")
+    return response['result']
+
+
+def _rpc_slot(response: Any) -> int:
+    """
+    Return the slot from a getSlot response.
+    
+    Raises:
+        ValueError if the response is an error or not a slot number
+    """
+    slot = _rpc_result(response)
+    if type(slot) is not int:
+        raise ValueError(f"Malformed getSlot result: {slot!r:.200}")
+    return slot
+
+
+def _rpc_ok(response: Any) -> bool:
+    """Whether a getHealth response reports the node healthy."""
+    return isinstance(response, dict) and response.get('result') == 'ok'
+
+
+def _rpc_version(response: Any) -> Optional[str]:
+    """Return solana-core from a getVersion response, None if absent."""
+    result = response.get('result') if isinstance(response, dict) else None
+    version = result.get('solana-core') if isinstance(result, dict) else None
+    return version if isinstance(version, str) and version else None
+
+
+def _rpc_batch(response: Any) -> Dict[Any, Any]:
+    """
+    Index a JSON-RPC batch response by request id.
+    
+    Raises:
+        ValueError if the response is not a batch
+    """
+    if not isinstance(response, list):
+        raise ValueError(f"Malformed JSON-RPC batch response: {response!r:.200}")
+    # Batch responses may arrive in any order
+    return {item.get('id'): item for item in response if isinstance(item, dict)}
+
+
+def _parse_compact(output: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Parse the compact "(us:123456 them:123460)" format with plain
+    substring searches.
+    
+    int() skips the whitespace around each number, so any spacing between
+    the two fields is accepted.
+    
+    Returns:
+        (local_slot, reference_slot), or None if the format isn't present
+    """
+    i = output.find(b'(us:')
+    if i < 0:
+        return None
+    j = output.find(b'them:', i)
+    if j < 0:
+        return None
+    k = output.find(b')', j)
+    if k < 0:
+        return None
+    try:
+        return int(output[i + 4:j]), int(output[j + 5:k])
+    except ValueError:
+        return None
+
+
+# A caught-up validator prints identical output poll after poll
+@functools.lru_cache(maxsize=64)
+def _parse_catchup_output(output: bytes) -> Optional[Tuple[int, int, int]]:
+    """
+    Parse solana catchup output.
+    
+    Returns:
+        (local_slot, reference_slot, slot_lag), or None if no known
+        format matched
+    """
+    # The compact format is by far the most common and needs no regex
+    compact = _parse_compact(output)
+    if compact is not None:
+        local_slot, reference_slot = compact
+        slot_lag = _slot_lag(local_slot, reference_slot)
+        logger.debug("Parsed compact format: local=%d, ref=%d, lag=%d", local_slot, reference_slot, slot_lag)
+        return local_slot, reference_slot, slot_lag
+    
+    match = _PARSE_RE.search(output)
+    if match is None:
+        return None
+    
+    g = match.groupdict()
+    if g['du'] is not None:
+        local_slot = int(g['du'])
+        reference_slot = int(g['dt'])
+        slot_lag = _slot_lag(local_slot, reference_slot)
+        logger.debug("Parsed detailed format: local=%d, ref=%d, lag=%d", local_slot, reference_slot, slot_lag)
+    else:
+        local_slot = int(g['ps'])
+        slot_lag = int(g['pb']) if g['pb'] is not None else 0
+        reference_slot = local_slot + slot_lag
+    return local_slot, reference_slot, slot_lag
+
+
+class _RpcConnection:
+    """Persistent keep-alive HTTP connection to a JSON-RPC endpoint."""
+    
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self._https = parts.scheme == 'https'
+        self._netloc = parts.netloc
+        self._path = parts.path or '/'
+        if parts.query:
+            self._path += f'?{parts.query}'
+        self._conn: Optional[http.client.HTTPConnection] = None
+        self._lock = threading.Lock()
+    
+    def post(self, body: bytes, timeout: float) -> bytes:
+        """
+        POST body and return the response body.
+        
+        If the server already closed an idle keep-alive connection, the
+        request is resent once on a fresh connection.
+        
+        Raises:
+            OSError, http.client.HTTPException on network or HTTP errors
+        """
+        with self._lock:
+            reused = self._conn is not None and self._conn.sock is not None
+            try:
+                return self._send(body, timeout)
+            except ConnectionError:
+                self.close()
+                if not reused:
+                    raise
+            except (OSError, http.client.HTTPException):
+                self.close()
+                raise
+            
+            # The idle connection had gone stale; retry once on a fresh one
+            try:
+                return self._send(body, timeout)
+            except Exception:
+                self.close()
+                raise
+    
+    def _send(self, body: bytes, timeout: float) -> bytes:
+        if self._conn is None:
+            if self._https:
+                self._conn = http.client.HTTPSConnection(self._netloc, timeout=timeout)
+            else:
+                self._conn = http.client.HTTPConnection(self._netloc, timeout=timeout)
+        elif self._conn.sock is not None:
+            self._conn.sock.settimeout(timeout)
+        self._conn.timeout = timeout
+        
+        self._conn.request('POST', self._path, body=body,
+                           headers={'Content-Type': 'application/json'})
+        response = self._conn.getresponse()
+        data = response.read()
+        if response.status != 200:
+            raise http.client.HTTPException(f"HTTP {response.status} {response.reason}")
+        return data
+    
+    def close(self):
+        """Drop the connection so the next request reconnects."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class _RpcPool:
+    """
+    Small pool of keep-alive connections to one JSON-RPC endpoint.
+    
+    Each request checks out its own connection, so concurrent callers never
+    wait on each other's round trips. Up to max_idle connections are kept
+    open between requests; extras are closed when returned.
+    """
+    
+    def __init__(self, url: str, max_idle: int = 4):
+        self._url = url
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=max_idle)
+    
+    def post(self, body: bytes, timeout: float) -> bytes:
+        """
+        POST body on a pooled connection and return the response body.
+        
+        Raises:
+            OSError, http.client.HTTPException on network or HTTP errors
+        """
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = _RpcConnection(self._url)
+        try:
+            return conn.post(body, timeout)
+        finally:
+            # A failed connection has already closed itself and reconnects
+            # on next use, so it can go back into the pool as well
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
 
 class SolanaClient:
-    """Wrapper for Solana CLI commands."""
+    """Wrapper for Solana JSON-RPC and CLI commands."""
+    
+    # Keep-alive connection pools shared by every client, one per endpoint URL
+    _POOLS: ClassVar[Dict[str, _RpcPool]] = {}
+    _POOLS_LOCK: ClassVar[threading.Lock] = threading.Lock()
     
     def __init__(self, local_rpc_port: int, reference_rpc_url: str):
         """
@@ -24,30 +337,215 @@ class SolanaClient:
         """
         self.local_rpc_port = local_rpc_port
         self.reference_rpc_url = reference_rpc_url
-        logger.info(f"Initialized SolanaClient with local port {local_rpc_port}")
+        self.local_rpc_url = f"http://localhost:{local_rpc_port}"
+        
+        # Keep-alive connections reused across ticks
+        self._local_rpc = self._pool(self.local_rpc_url)
+        self._reference_rpc = self._pool(reference_rpc_url)
+        
+        # (fetched_at, slot) of the last reference getSlot
+        self._ref_cache: Tuple[float, Optional[int]] = (0.0, None)
+        
+        # CLI fallback commands. The binary is looked up on PATH once, so
+        # each exec is a single execve rather than a PATH search
+        solana = shutil.which("solana") or "solana"
+        self._catchup_cmd = (solana, "catchup", "--our-localhost", str(local_rpc_port))
+        self._version_cmd = (solana, "--version")
+        
+        # The node binary can't change without restarting the agent.
+        # getVersion reports the bare "1.18.22" while solana --version adds
+        # a prefix and build details, so the two are cached separately and
+        # only the RPC value stops getVersion from being requested
+        self._version_cache: Optional[str] = None
+        self._cli_version_cache: Optional[str] = None
+        
+        logger.info("Initialized SolanaClient with local port %s", local_rpc_port)
+    
+    @classmethod
+    def _pool(cls, url: str) -> _RpcPool:
+        """Return the shared connection pool for url, creating it on first use."""
+        with cls._POOLS_LOCK:
+            pool = cls._POOLS.get(url)
+            if pool is None:
+                pool = cls._POOLS[url] = _RpcPool(url)
+            return pool
+    
+    def _rpc(self, conn: _RpcPool, body: bytes, timeout: float = 10) -> Any:
+        """
+        POST an encoded JSON-RPC request (or batch of requests) and decode
+        the response.
+        
+        Raises:
+            OSError, http.client.HTTPException, ValueError on network,
+            HTTP or decoding failures
+        """
+        if orjson is not None:
+            return orjson.loads(conn.post(body, timeout))
+        return json.loads(conn.post(body, timeout))
+    
+    def _get_reference_slot(self) -> int:
+        """Fetch the cluster tip slot from the reference RPC (briefly cached)."""
+        now = time.monotonic()
+        fetched_at, slot = self._ref_cache
+        if slot is not None and now - fetched_at < _REFERENCE_SLOT_TTL:
+            return slot
+        
+        slot = _rpc_slot(self._rpc(self._reference_rpc, _GET_SLOT))
+        self._ref_cache = (now, slot)
+        return slot
+    
+    def check_reference_cluster(self) -> bool:
+        """
+        Check that the reference RPC serves the same cluster as the local
+        node by comparing their genesis hashes.
+        
+        Returns:
+            False if the two are on different clusters, True otherwise
+            (including when either endpoint can't be queried)
+        """
+        try:
+            reference_future = _EXECUTOR.submit(self._rpc, self._reference_rpc, _GET_GENESIS_HASH)
+            local_hash = _rpc_result(self._rpc(self._local_rpc, _GET_GENESIS_HASH))
+            reference_hash = _rpc_result(reference_future.result())
+        except _RPC_ERRORS as e:
+            logger.info("Could not compare genesis hashes with the reference RPC: %s", e)
+            return True
+        
+        if local_hash != reference_hash:
+            logger.warning(
+                "Reference RPC is on a different cluster than the local node "
+                "(genesis %s vs %s); slot lag will be meaningless. Point "
+                "HELIUS_RPC_URL/PUBLIC_RPC_URL at the node's cluster.",
+                reference_hash, local_hash
+            )
+            return False
+        return True
     
-    def get_catchup_status(self) -> Optional[Dict[str, int]]:
+    def _wait_reference_slot(self, reference_future) -> Optional[int]:
+        """
+        Get the reference slot from a pending _get_reference_slot call,
+        asking solana catchup for the cluster slot if the reference RPC
+        failed.
+        
+        Returns:
+            The cluster slot, or None if neither source could provide it
+        """
+        try:
+            return reference_future.result()
+        except _RPC_ERRORS as e:
+            logger.warning("Reference RPC slot query failed, falling back to CLI: %s", e)
+        
+        catchup_status = self._get_catchup_status_cli()
+        if catchup_status is None:
+            return None
+        return catchup_status['reference_slot']
+    
+    def get_node_status(self) -> Optional[Dict[str, Any]]:
+        """
+        Fetch slot, health and version of the local node in one batched
+        JSON-RPC call, plus the reference slot.
+        
+        Falls back to the solana CLI if the local node can't be queried.
+        If only the reference RPC fails, the local results are kept and
+        just the cluster slot is taken from solana catchup.
+        
+        Returns:
+            Dictionary with 'local_slot', 'reference_slot', 'slot_lag',
+            'healthy' and 'version'; 'reference_slot' and 'slot_lag' are
+            None if the cluster slot could not be determined
+            None if the local slot could not be determined
+        """
+        try:
+            # Query the reference RPC concurrently with the local batch
+            reference_future = _EXECUTOR.submit(self._get_reference_slot)
+            # The version only needs fetching until it has been cached
+            if self._version_cache is None:
+                batch = _STATUS_BATCH_WITH_VERSION
+            else:
+                batch = _STATUS_BATCH
+            results = _rpc_batch(self._rpc(self._local_rpc, batch))
+            local_slot = _rpc_slot(results.get(1))
+        except _RPC_ERRORS as e:
+            logger.warning("JSON-RPC status query failed, falling back to CLI: %s", e)
+            return self._get_node_status_cli()
+        
+        if self._version_cache is None:
+            version = _rpc_version(results.get(3))
+            if version:
+                self._version_cache = version
+        
+        reference_slot = self._wait_reference_slot(reference_future)
+        return {
+            'local_slot': local_slot,
+            'reference_slot': reference_slot,
+            'slot_lag': None if reference_slot is None else _slot_lag(local_slot, reference_slot),
+            'healthy': _rpc_ok(results.get(2)),
+            'version': self._version_cache
+        }
+    
+    def _get_node_status_cli(self) -> Optional[Dict[str, Any]]:
+        """get_node_status() via solana catchup, for when the local RPC fails."""
+        catchup_status = self._get_catchup_status_cli()
+        if catchup_status is None:
+            return None
+        
+        return {
+            **catchup_status,
+            'healthy': self.is_healthy(),
+            'version': self._version_cache or self._get_node_version_cli()
+        }
+    
+    def get_catchup_status(self, fast: bool = False) -> Optional[Dict[str, int]]:
+        """
+        Get local and reference slots via getSlot and compute the lag.
+        
+        Falls back to parsing solana catchup output if RPC fails.
+        
+        Args:
+            fast: Passed to the CLI fallback for callers that only need
+                'slot_lag'
+        
+        Returns:
+            Dictionary with 'local_slot', 'reference_slot', and 'slot_lag'
+            None if the slots could not be determined
+        """
+        try:
+            reference_future = _EXECUTOR.submit(self._get_reference_slot)
+            local_slot = _rpc_slot(self._rpc(self._local_rpc, _GET_SLOT))
+            reference_slot = reference_future.result()
+            slot_lag = _slot_lag(local_slot, reference_slot)
+            return {
+                'local_slot': local_slot,
+                'reference_slot': reference_slot,
+                'slot_lag': slot_lag
+            }
+        except _RPC_ERRORS as e:
+            logger.warning("JSON-RPC slot query failed, falling back to CLI: %s", e)
+        
+        return self._get_catchup_status_cli(fast)
+    
+    def _get_catchup_status_cli(self, fast: bool = False) -> Optional[Dict[str, int]]:
         """
         Execute solana catchup command and parse the output.
         
+        Args:
+            fast: If the CLI reports the node caught up, return a zero lag
+                without parsing the slot numbers (reported as -1)
+        
         Returns:
             Dictionary with 'local_slot', 'reference_slot', and 'slot_lag'
             None if command fails
         """
         try:
             # Execute: solana catchup --our-localhost <port>
-            cmd = ["solana", "catchup", "--our-localhost", str(self.local_rpc_port)]
-            logger.debug(f"Executing command: {' '.join(cmd)}")
+            cmd = self._catchup_cmd
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Executing command: %s", ' '.join(cmd))
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            result = _run_cli(cmd)
             
             if result.returncode != 0:
-                logger.error(f"Catchup command failed: {result.stderr}")
+                logger.error("Catchup command failed: %s", result.stderr.decode('utf-8', 'replace'))
                 return None
             
             # Parse output to extract slot information
@@ -56,50 +554,21 @@ class SolanaClient:
             # "Our validator: slot=396425415\nCluster:       slot=396425420"
             # "Validator is caught up. Processed slot 245678906"
             
-            output = result.stdout.strip()
-            logger.debug(f"Catchup output: {output}")
+            # The patterns skip surrounding whitespace, so no strip() copy
+            output = result.stdout
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Catchup output: %s", output.strip())
             
-            # Try to parse compact "caught up" format first
-            # Format: "has caught up (us:123456 them:123460)"
-            compact_match = re.search(r'\(us:(\d+)\s+them:(\d+)\)', output)
-            if compact_match:
-                local_slot = int(compact_match.group(1))
-                reference_slot = int(compact_match.group(2))
-                slot_lag = max(0, reference_slot - local_slot)
-                logger.debug(f"Parsed compact format: local={local_slot}, ref={reference_slot}, lag={slot_lag}")
+            if fast and b'caught up' in output:
                 return {
-                    'local_slot': local_slot,
-                    'reference_slot': reference_slot,
-                    'slot_lag': slot_lag
-                }
-            
-            # Try detailed format with separate lines
-            # Format: "Our validator: slot=123456" and "Cluster: slot=123460"
-            our_match = re.search(r'Our validator:\s+slot[=\s]+(\d+)', output, re.IGNORECASE)
-            cluster_match = re.search(r'Cluster:\s+slot[=\s]+(\d+)', output, re.IGNORECASE)
-            
-            if our_match and cluster_match:
-                local_slot = int(our_match.group(1))
-                reference_slot = int(cluster_match.group(1))
-                slot_lag = max(0, reference_slot - local_slot)
-                logger.debug(f"Parsed detailed format: local={local_slot}, ref={reference_slot}, lag={slot_lag}")
-                return {
-                    'local_slot': local_slot,
-                    'reference_slot': reference_slot,
-                    'slot_lag': slot_lag
+                    'local_slot': -1,
+                    'reference_slot': -1,
+                    'slot_lag': 0
                 }
             
-            # Fallback: try old "Processed slot" format
-            slot_match = re.search(r'Processed slot (\d+)', output)
-            if slot_match:
-                local_slot = int(slot_match.group(1))
-                behind_match = re.search(r'behind by (\d+) slots', output)
-                if behind_match:
-                    slot_lag = int(behind_match.group(1))
-                    reference_slot = local_slot + slot_lag
-                else:
-                    slot_lag = 0
-                    reference_slot = local_slot
+            parsed = _parse_catchup_output(output)
+            if parsed is not None:
+                local_slot, reference_slot, slot_lag = parsed
                 return {
                     'local_slot': local_slot,
                     'reference_slot': reference_slot,
@@ -107,46 +576,54 @@ class SolanaClient:
                 }
             
             # Could not parse
-            logger.error(f"Could not parse slot from output: {output}")
+            logger.error("Could not parse slot from output: %s", output.strip())
             return None
             
-            return {
-                'local_slot': local_slot,
-                'reference_slot': reference_slot,
-                'slot_lag': slot_lag
-            }
-            
         except subprocess.TimeoutExpired:
             logger.error("Catchup command timed out")
             return None
         except Exception as e:
-            logger.error(f"Error executing catchup command: {e}")
+            logger.error("Error executing catchup command: %s", e)
             return None
     
     def get_node_version(self) -> Optional[str]:
-        """Get Solana node version."""
+        """
+        Get Solana node version via getVersion, falling back to the CLI.
+        
+        Cached after the first successful call.
+        """
+        if self._version_cache is not None:
+            return self._version_cache
+        
         try:
-            result = subprocess.run(
-                ["solana", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            version = _rpc_version(self._rpc(self._local_rpc, _GET_VERSION))
+            if version:
+                self._version_cache = version
+                return version
+        except _RPC_ERRORS as e:
+            logger.warning("JSON-RPC version query failed, falling back to CLI: %s", e)
+        
+        return self._get_node_version_cli()
+    
+    def _get_node_version_cli(self) -> Optional[str]:
+        """Get Solana CLI version via solana --version (cached on success)."""
+        if self._cli_version_cache is not None:
+            return self._cli_version_cache
+        
+        try:
+            result = _run_cli(self._version_cmd)
             if result.returncode == 0:
-                return result.stdout.strip()
+                self._cli_version_cache = result.stdout.decode('utf-8', 'replace').strip()
+                return self._cli_version_cache
             return None
         except Exception as e:
-            logger.error(f"Error getting node version: {e}")
+            logger.error("Error getting node version: %s", e)
             return None
     
     def is_healthy(self) -> bool:
-        """Check if Solana node is responding."""
+        """Check if Solana node reports itself healthy via getHealth."""
         try:
-            result = subprocess.run(
-                ["solana", "--url", f"http://localhost:{self.local_rpc_port}", "cluster-version"],
-                capture_output=True,
-                timeout=10
-            )
-            return result.returncode == 0
-        except Exception:
+            return _rpc_ok(self._rpc(self._local_rpc, _GET_HEALTH, timeout=3))
+        except _RPC_ERRORS as e:
+            logger.debug("Health check failed: %s", e)
             return False